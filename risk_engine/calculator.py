@@ -13,18 +13,30 @@ Converts Cortex analyzer verdicts into a quantitative financial risk score.
 from __future__ import annotations
 
 import logging
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List
 
 from risk_engine import config
 from risk_engine.models import (
     AnalyzerResult,
     CaseRiskAssessment,
+    Level,
     ObservableRisk,
     RiskScore,
 )
 
 logger = logging.getLogger(__name__)
 
+# Bound once at import so the scoring loops don't re-resolve config attributes.
+# Verdict weights are laid out by Level code so each result is a tuple index.
+_LEVEL_WEIGHTS = tuple(
+    config.VERDICT_WEIGHTS.get(level.name.lower(), 0.0) for level in Level
+)
+_MALICIOUS = Level.MALICIOUS.value
+_CONSENSUS_THRESHOLD = config.MALICIOUS_CONSENSUS_THRESHOLD
+_CONSENSUS_BOOST = config.MALICIOUS_CONSENSUS_BOOST
+
 
 # -----------------------------------------------------------------------
 # Likelihood
@@ -43,20 +55,25 @@ def compute_likelihood(results: List[AnalyzerResult]) -> float:
     if not results:
         return 0.0
 
-    weights = [
-        config.VERDICT_WEIGHTS.get(r.level, 0.0) for r in results
-    ]
-    avg = sum(weights) / len(weights)
+    # Single pass: weighted sum plus the distinct malicious analyzers,
+    # which only need collecting until the consensus threshold is reached.
+    total = 0.0
+    malicious_analyzers = set()
+    for r in results:
+        code = r.level_code
+        total += _LEVEL_WEIGHTS[code]
+        if code == _MALICIOUS and len(malicious_analyzers) < _CONSENSUS_THRESHOLD:
+            malicious_analyzers.add(r.analyzer_name)
+    avg = total / len(results)
 
     # Consensus boost
-    unique_analyzers = len({r.analyzer_name for r in results if r.level == "malicious"})
-
-    if unique_analyzers >= config.MALICIOUS_CONSENSUS_THRESHOLD:
-        avg *= config.MALICIOUS_CONSENSUS_BOOST
-        logger.debug(
-            "Consensus boost applied (%d independent malicious verdicts)",
-            unique_analyzers,
-        )
+    if len(malicious_analyzers) >= _CONSENSUS_THRESHOLD:
+        avg *= _CONSENSUS_BOOST
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Consensus boost applied (%d+ independent malicious verdicts)",
+                _CONSENSUS_THRESHOLD,
+            )
 
     return min(avg, 1.0)
 
@@ -65,6 +82,14 @@ def compute_likelihood(results: List[AnalyzerResult]) -> float:
 # Impact
 # -----------------------------------------------------------------------
 
+_asset_value = config.ASSET_VALUES.get
+_sensitivity_multiplier = config.SENSITIVITY_MULTIPLIERS.get
+_exposure_weight = config.B2C_EXPOSURE_WEIGHTS.get
+_DEFAULT_MULTIPLIER = config.SENSITIVITY_MULTIPLIERS[config.DEFAULT_SENSITIVITY]
+_DEFAULT_EXPOSURE_WEIGHT = config.B2C_EXPOSURE_WEIGHTS[config.DEFAULT_EXPOSURE_TYPE]
+
+
+@lru_cache(maxsize=64)
 def compute_impact(
     asset_type: str,
     sensitivity: str,
@@ -76,21 +101,18 @@ def compute_impact(
 
     B2B:  Impact ($) = base_asset_value × sensitivity_multiplier
     B2C:  Impact     = exposure_severity_score  (0-100)
+
+    Keys must already be lowercase (as in config); mixed-case keys fall
+    back to the defaults. process_case() normalises them once when the case
+    is assembled. Results are memoised: the inputs come from a small fixed
+    vocabulary, so watch mode sees the same few combinations over and over.
     """
     if profile == "consumer":
-        return float(
-            config.B2C_EXPOSURE_WEIGHTS.get(
-                exposure_type.lower(), config.B2C_EXPOSURE_WEIGHTS[config.DEFAULT_EXPOSURE_TYPE]
-            )
-        )
+        return float(_exposure_weight(exposure_type, _DEFAULT_EXPOSURE_WEIGHT))
 
     # B2B path (default)
-    base = config.ASSET_VALUES.get(
-        asset_type.lower(), config.DEFAULT_ASSET_VALUE
-    )
-    multiplier = config.SENSITIVITY_MULTIPLIERS.get(
-        sensitivity.lower(), config.SENSITIVITY_MULTIPLIERS[config.DEFAULT_SENSITIVITY]
-    )
+    base = _asset_value(asset_type, config.DEFAULT_ASSET_VALUE)
+    multiplier = _sensitivity_multiplier(sensitivity, _DEFAULT_MULTIPLIER)
     return float(base * multiplier)
 
 
@@ -98,25 +120,22 @@ def compute_impact(
 # Risk Level
 # -----------------------------------------------------------------------
 
+# Ascending lower bounds per profile. bisect_right counts how many bounds a
+# score has reached, which indexes straight into _RISK_LABELS.
+_RISK_LABELS = ("Info", "Low", "Medium", "High", "Critical")
+_LEVEL_KEYS = ("low", "medium", "high", "critical")
+
+_B2B_BOUNDS = tuple(config.RISK_THRESHOLDS[k] for k in _LEVEL_KEYS)
+_B2C_BOUNDS = tuple(config.B2C_SEVERITY_THRESHOLDS[k] for k in _LEVEL_KEYS)
+
+
 def classify_risk(ale: float, *, profile: str = "b2b") -> str:
     """Map a score to a human-readable risk level.
 
     B2B uses dollar-based ALE thresholds; B2C uses 0-100 severity thresholds.
     """
-    thresholds = (
-        config.B2C_SEVERITY_THRESHOLDS if profile == "consumer"
-        else config.RISK_THRESHOLDS
-    )
-
-    if ale >= thresholds["critical"]:
-        return "Critical"
-    if ale >= thresholds["high"]:
-        return "High"
-    if ale >= thresholds["medium"]:
-        return "Medium"
-    if ale >= thresholds["low"]:
-        return "Low"
-    return "Info"
+    bounds = _B2C_BOUNDS if profile == "consumer" else _B2B_BOUNDS
+    return _RISK_LABELS[bisect_right(bounds, ale)]
 
 
 # -----------------------------------------------------------------------
@@ -137,18 +156,18 @@ def score_case(assessment: CaseRiskAssessment) -> RiskScore:
     because a single highly-malicious indicator is enough to drive risk.
 
     Supports both B2B (ALE in dollars) and B2C consumer (severity 0-100)
-    profiles via assessment.profile.
+    profiles via assessment.profile. Profile, asset type, sensitivity and
+    exposure type must already be lowercase (see compute_impact).
     """
     profile = assessment.profile
+    assessment.rendered_report = None
 
-    # Score each observable
-    likelihoods: List[float] = []
+    # Score each observable; case likelihood = running max across
+    # observables (worst-case driver)
+    case_likelihood = 0.0
     for obs_risk in assessment.observables:
         lh = score_observable(obs_risk)
-        likelihoods.append(lh)
-
-    # Case likelihood = max across observables (worst-case driver)
-    case_likelihood = max(likelihoods) if likelihoods else 0.0
+        case_likelihood = max(case_likelihood, lh)
 
     # Impact — B2B uses asset value × sensitivity; B2C uses exposure weight
     impact = compute_impact(
@@ -171,8 +190,9 @@ def score_case(assessment: CaseRiskAssessment) -> RiskScore:
 
     score_label = "ALE" if profile == "b2b" else "severity"
     logger.info(
-        "Case %s scored [%s]: likelihood=%.2f, impact=%.2f, %s=%.2f (%s)",
+        "Case %s (%s) scored [%s]: likelihood=%.2f, impact=%.2f, %s=%.2f (%s)",
         assessment.case_id,
+        assessment.case_title,
         profile,
         risk.likelihood,
         risk.impact_dollars,
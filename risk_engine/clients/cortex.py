@@ -7,9 +7,13 @@ Reads analyzer job results from Cortex to extract threat verdicts.
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from risk_engine import config
 from risk_engine.models import AnalyzerResult
@@ -24,8 +28,17 @@ class CortexClient:
         self,
         url: str = config.CORTEX_URL,
         api_key: str = config.CORTEX_API_KEY,
+        cache_ttl: int = config.CORTEX_CACHE_TTL,
+        cache_size: int = config.CORTEX_CACHE_SIZE,
     ):
         self.base_url = url.rstrip("/")
+        self.cache_ttl = cache_ttl  # seconds; <= 0 disables the result cache
+        self.cache_size = cache_size  # entries; <= 0 also disables it
+        # (value, data_type) -> (expiry, results), oldest entry first
+        self._cache: OrderedDict[
+            Tuple[str, str], Tuple[float, List[AnalyzerResult]]
+        ] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -33,6 +46,11 @@ class CortexClient:
                 "Content-Type": "application/json",
             }
         )
+        # process_case queries Cortex from a thread pool; size the
+        # connection pool to match so workers don't discard connections.
+        adapter = HTTPAdapter(pool_maxsize=config.ENRICHMENT_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     # ------------------------------------------------------------------
     # Low-level request helper
@@ -127,7 +145,32 @@ class CortexClient:
     def get_analyzer_results(
         self, observable_value: str, data_type: str
     ) -> List[AnalyzerResult]:
-        """Convenience: fetch all Cortex jobs for an observable and return parsed verdicts."""
+        """Convenience: fetch all Cortex jobs for an observable and return parsed verdicts.
+
+        When ``cache_ttl`` is set (it is 0, i.e. off, by default), non-empty
+        results are cached per (value, data_type) for that many seconds, so
+        indicators that recur across cases in watch mode skip the round-trips.
+        Only completed jobs are returned, so a cached result can be partial:
+        verdicts from analyzers that finish within the TTL, malicious ones
+        included, are not seen until the entry expires. Empty results are
+        never cached.
+        """
+        key = (observable_value, data_type)
+        caching = self.cache_ttl > 0 and self.cache_size > 0
+        if caching:
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.debug("Cortex cache hit for %s (%s)", observable_value, data_type)
+                return list(cached)
+
+        results = self._fetch_analyzer_results(observable_value, data_type)
+        if caching and results:
+            self._cache_put(key, results)
+        return list(results)
+
+    def _fetch_analyzer_results(
+        self, observable_value: str, data_type: str
+    ) -> List[AnalyzerResult]:
         jobs = self.get_observable_jobs(observable_value, data_type)
         all_results: List[AnalyzerResult] = []
         for job in jobs:
@@ -140,6 +183,29 @@ class CortexClient:
             all_results.extend(self.extract_verdicts(job))
         return all_results
 
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[List[AnalyzerResult]]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expiry, results = entry
+            if expiry <= time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return results
+
+    def _cache_put(self, key: Tuple[str, str], results: List[AnalyzerResult]) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
 
 # --------------------------------------------------------------------------
 # Helpers
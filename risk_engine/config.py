@@ -6,10 +6,28 @@ All values have sensible defaults for local development.
 """
 
 import os
+from types import MappingProxyType
+
 from dotenv import load_dotenv
 
-# Load .env from project root (one level up from risk_engine/)
-load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+# importlib.reload() re-executes this module in the same namespace, so keep
+# any flag already set by a previous load.
+_ENV_LOADED = globals().get("_ENV_LOADED", False)
+
+
+def _ensure_env() -> None:
+    """Load .env from project root (one level up from risk_engine/), once per process.
+
+    All settings below are read into module constants at import time, so
+    watch mode never goes back to the environment on each poll.
+    """
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
+        _ENV_LOADED = True
+
+
+_ensure_env()
 
 
 # ---------------------------------------------------------------------------
@@ -22,17 +40,20 @@ THEHIVE_API_KEY = os.getenv("THEHIVE_API_KEY", "")
 CORTEX_URL = os.getenv("CORTEX_URL", "http://localhost:9001")
 CORTEX_API_KEY = os.getenv("CORTEX_API_KEY", "")
 
+# Lookup tables below are wrapped in read-only MappingProxyType views: the
+# calculator binds them once at import, so they must not be mutated at runtime.
+
 # ---------------------------------------------------------------------------
 # Asset Value Tiers (USD)
 # Used when a case doesn't specify its own asset value via tags/custom fields.
 # ---------------------------------------------------------------------------
 
-ASSET_VALUES = {
+ASSET_VALUES = MappingProxyType({
     "workstation": 5_000,
     "server": 50_000,
     "database": 500_000,
     "critical_infra": 2_000_000,
-}
+})
 
 DEFAULT_ASSET_VALUE = int(os.getenv("DEFAULT_ASSET_VALUE", "50000"))
 
@@ -41,12 +62,12 @@ DEFAULT_ASSET_VALUE = int(os.getenv("DEFAULT_ASSET_VALUE", "50000"))
 # Applied on top of the base asset value.
 # ---------------------------------------------------------------------------
 
-SENSITIVITY_MULTIPLIERS = {
+SENSITIVITY_MULTIPLIERS = MappingProxyType({
     "public": 1.0,
     "internal": 2.0,
     "confidential": 5.0,
     "restricted": 10.0,
-}
+})
 
 DEFAULT_SENSITIVITY = "internal"
 
@@ -55,12 +76,12 @@ DEFAULT_SENSITIVITY = "internal"
 # Each Cortex taxonomy level maps to a weight between 0 and 1.
 # ---------------------------------------------------------------------------
 
-VERDICT_WEIGHTS = {
+VERDICT_WEIGHTS = MappingProxyType({
     "malicious": 1.0,
     "suspicious": 0.6,
     "safe": 0.1,
     "info": 0.0,
-}
+})
 
 # Bonus multiplier when >=N independent analyzers agree on "malicious"
 MALICIOUS_CONSENSUS_THRESHOLD = 2
@@ -70,13 +91,13 @@ MALICIOUS_CONSENSUS_BOOST = 1.25  # 25 % bump, capped at 1.0
 # Risk Level Thresholds (ALE in USD)
 # ---------------------------------------------------------------------------
 
-RISK_THRESHOLDS = {
+RISK_THRESHOLDS = MappingProxyType({
     "critical": 500_000,
     "high": 100_000,
     "medium": 10_000,
     "low": 1_000,
     # anything below "low" is "info"
-}
+})
 
 # ---------------------------------------------------------------------------
 # B2C Consumer Identity-Theft Scoring Profile
@@ -84,7 +105,7 @@ RISK_THRESHOLDS = {
 # Exposure types map to base severity scores (0-100 scale).
 # Used instead of ASSET_VALUES when a case is tagged profile:consumer.
 
-B2C_EXPOSURE_WEIGHTS = {
+B2C_EXPOSURE_WEIGHTS = MappingProxyType({
     "email_only": 15,       # Low — change password, enable MFA
     "phone": 25,            # Moderate — SIM swap risk
     "credit_card": 40,      # Moderate — replaceable, fraud protection exists
@@ -93,18 +114,18 @@ B2C_EXPOSURE_WEIGHTS = {
     "medical_records": 80,  # Severe — medical identity theft
     "ssn": 85,              # Severe — credit fraud, tax fraud, long recovery
     "ssn_and_dl": 95,       # Critical — full identity takeover
-}
+})
 
 DEFAULT_EXPOSURE_TYPE = "email_only"
 
 # Severity thresholds for B2C composite score (likelihood × exposure weight)
-B2C_SEVERITY_THRESHOLDS = {
+B2C_SEVERITY_THRESHOLDS = MappingProxyType({
     "critical": 80,
     "high": 60,
     "medium": 35,
     "low": 15,
     # anything below "low" is "info"
-}
+})
 
 # ---------------------------------------------------------------------------
 # Watch-mode defaults
@@ -114,3 +135,13 @@ WATCH_INTERVAL_SECONDS = int(os.getenv("WATCH_INTERVAL", "30"))
 
 # Tag applied to cases after scoring so they aren't re-scored
 SCORED_TAG = "risk:scored"
+
+# Max concurrent Cortex lookups when enriching a case's observables
+ENRICHMENT_WORKERS = max(1, int(os.getenv("ENRICHMENT_WORKERS", "8")))
+
+# How long (seconds) Cortex verdicts for an observable are reused across
+# cases, and how many observables to remember. A TTL or size of 0 disables
+# caching. Off by default: a cached result can be missing verdicts from
+# analyzers that finish during the TTL, and scored cases are never rescored.
+CORTEX_CACHE_TTL = int(os.getenv("CORTEX_CACHE_TTL", "0"))
+CORTEX_CACHE_SIZE = max(0, int(os.getenv("CORTEX_CACHE_SIZE", "4096")))
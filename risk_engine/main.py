@@ -17,13 +17,15 @@ import argparse
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Mapping
 
 from risk_engine import config
 from risk_engine.clients.thehive import TheHiveClient
 from risk_engine.clients.cortex import CortexClient
 from risk_engine.calculator import score_case
 from risk_engine.reporter import generate_report
-from risk_engine.models import CaseRiskAssessment, ObservableRisk
+from risk_engine.models import CaseRiskAssessment, Observable, ObservableRisk
 
 logger = logging.getLogger("risk_engine")
 
@@ -55,11 +57,13 @@ def process_case(
     case_severity = case.get("severity", 2)
     case_tags = case.get("tags", [])
 
-    # Detect profile from tags if not overridden
-    if not profile:
+    # Detect profile from tags if not overridden (tag values come back lowercased)
+    if profile:
+        profile = profile.lower()
+    else:
         profile = _extract_tag(case_tags, "profile:", "b2b")
 
-    logger.info("Processing case [%s]: %s — %s", profile, case_id, case_title)
+    logger.debug("Processing case [%s]: %s — %s", profile, case_id, case_title)
 
     if profile == "consumer":
         # B2C: derive exposure type from tags
@@ -72,14 +76,29 @@ def process_case(
         if not sensitivity:
             sensitivity = _extract_tag(case_tags, "sensitivity:", config.DEFAULT_SENSITIVITY)
 
+    # Config keys are lowercase; normalise CLI overrides once here so the
+    # scoring functions can look them up as-is.
+    asset_type = asset_type.lower()
+    sensitivity = sensitivity.lower()
+    exposure_type = exposure_type.lower()
+
+    # Resolve unknown values to their defaults once, here, so the report
+    # shows what was actually scored. Unknown asset types keep their name
+    # and are valued at DEFAULT_ASSET_VALUE by the calculator.
+    if profile == "consumer":
+        exposure_type = _known_or_default(
+            exposure_type, config.B2C_EXPOSURE_WEIGHTS, config.DEFAULT_EXPOSURE_TYPE, "exposure type"
+        )
+    else:
+        sensitivity = _known_or_default(
+            sensitivity, config.SENSITIVITY_MULTIPLIERS, config.DEFAULT_SENSITIVITY, "sensitivity"
+        )
+
     # 2. Get observables
     observables = hive.get_case_observables(case_id)
 
     # 3. Enrich each observable with Cortex results
-    obs_risks = []
-    for obs in observables:
-        results = cortex.get_analyzer_results(obs.value, obs.data_type)
-        obs_risks.append(ObservableRisk(observable=obs, analyzer_results=results))
+    obs_risks = _enrich_observables(observables, cortex)
 
     # 4. Build assessment and score
     assessment = CaseRiskAssessment(
@@ -100,15 +119,8 @@ def process_case(
     hive.add_task_log(task_id, report_md)
     hive.add_case_tag(case_id, config.SCORED_TAG)
 
-    risk = assessment.risk_score
-    score_label = "severity" if profile == "consumer" else "ALE $"
-    logger.info(
-        "Case %s scored: %s (%s%s)",
-        case_id,
-        risk.risk_level if risk else "N/A",
-        score_label,
-        f"{risk.ale:,.2f}" if risk else "0",
-    )
+    # The per-case INFO summary is logged by score_case
+    logger.debug("Case %s report posted to task %s", case_id, task_id)
     return assessment
 
 
@@ -119,7 +131,7 @@ def process_case(
 def cmd_score(args: argparse.Namespace) -> None:
     """Score a single case by ID."""
     hive = TheHiveClient()
-    cortex = CortexClient()
+    cortex = _cortex_client(args)
     assessment = process_case(
         args.case_id,
         hive,
@@ -149,33 +161,11 @@ def cmd_score(args: argparse.Namespace) -> None:
 
 def cmd_health(args: argparse.Namespace) -> None:
     """Check connectivity to TheHive and Cortex. Exits 0 if healthy, 1 otherwise."""
-    import requests
+    services = [("TheHive", config.THEHIVE_URL), ("Cortex", config.CORTEX_URL)]
 
-    healthy = True
-
-    # Check TheHive
-    try:
-        resp = requests.get(f"{config.THEHIVE_URL}/api/status", timeout=5)
-        if resp.ok:
-            logger.debug("TheHive is reachable")
-        else:
-            logger.warning("TheHive returned status %d", resp.status_code)
-            healthy = False
-    except Exception:
-        logger.warning("TheHive is unreachable at %s", config.THEHIVE_URL)
-        healthy = False
-
-    # Check Cortex
-    try:
-        resp = requests.get(f"{config.CORTEX_URL}/api/status", timeout=5)
-        if resp.ok:
-            logger.debug("Cortex is reachable")
-        else:
-            logger.warning("Cortex returned status %d", resp.status_code)
-            healthy = False
-    except Exception:
-        logger.warning("Cortex is unreachable at %s", config.CORTEX_URL)
-        healthy = False
+    # Probe both services at once so a dead endpoint costs one timeout, not two
+    with ThreadPoolExecutor(max_workers=len(services)) as pool:
+        healthy = all(pool.map(lambda svc: _probe_status(*svc), services))
 
     if healthy:
         print("healthy")
@@ -189,7 +179,7 @@ def cmd_watch(args: argparse.Namespace) -> None:
     """Poll for unscored cases on a loop."""
     interval = args.interval
     hive = TheHiveClient()
-    cortex = CortexClient()
+    cortex = _cortex_client(args)
 
     logger.info("Watch mode started (polling every %ds)", interval)
     print(f"Risk Engine watching for new cases (every {interval}s). Ctrl+C to stop.")
@@ -216,11 +206,65 @@ def cmd_watch(args: argparse.Namespace) -> None:
 # Helpers
 # -----------------------------------------------------------------------
 
+def _cortex_client(args: argparse.Namespace) -> CortexClient:
+    """Build the Cortex client, honouring --no-cache."""
+    if args.no_cache:
+        return CortexClient(cache_ttl=0)
+    return CortexClient()
+
+
+def _enrich_observables(
+    observables: List[Observable], cortex: CortexClient
+) -> List[ObservableRisk]:
+    """Fetch Cortex verdicts for each observable, preserving order.
+
+    Each lookup is an independent HTTP round-trip, so they run on a small
+    thread pool instead of one after another.
+    """
+    if not observables:
+        return []
+
+    def enrich(obs: Observable) -> ObservableRisk:
+        results = cortex.get_analyzer_results(obs.value, obs.data_type)
+        return ObservableRisk(observable=obs, analyzer_results=results)
+
+    workers = min(config.ENRICHMENT_WORKERS, len(observables))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(enrich, observables))
+
+
+def _probe_status(name: str, url: str) -> bool:
+    """GET ``<url>/api/status`` and report whether the service answered OK."""
+    import requests
+
+    try:
+        resp = requests.get(f"{url}/api/status", timeout=5)
+    except Exception:
+        logger.warning("%s is unreachable at %s", name, url)
+        return False
+    if not resp.ok:
+        logger.warning("%s returned status %d", name, resp.status_code)
+        return False
+    logger.debug("%s is reachable", name)
+    return True
+
+
+def _known_or_default(value: str, known: Mapping[str, Any], default: str, what: str) -> str:
+    """Return *value* if it is a configured key, otherwise *default* (with a warning)."""
+    if value in known:
+        return value
+    logger.warning("Unknown %s '%s', using '%s'", what, value, default)
+    return default
+
+
 def _extract_tag(tags: list, prefix: str, default: str) -> str:
-    """Pull a value from a tag list by prefix (e.g., 'asset:server' → 'server')."""
+    """Pull a lowercased value from a tag list by prefix (e.g., 'asset:Server' → 'server')."""
+    prefix = prefix.lower()
+    plen = len(prefix)
     for tag in tags:
-        if tag.lower().startswith(prefix.lower()):
-            return tag[len(prefix):]
+        # Only lowercase the candidate prefix slice, not the whole tag
+        if tag[:plen].lower() == prefix:
+            return tag[plen:].lower()
     return default
 
 
@@ -236,6 +280,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable debug logging"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query Cortex, even if CORTEX_CACHE_TTL enables reuse of recent verdicts",
+    )
     sub = parser.add_subparsers(dest="command", required=True)
 
     # -- score --
@@ -9,10 +9,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional
+from enum import IntEnum
+from typing import List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class Observable:
     """A single observable extracted from a TheHive case."""
 
@@ -23,9 +24,32 @@ class Observable:
     tags: List[str] = field(default_factory=list)
 
 
-@dataclass
+class Level(IntEnum):
+    """Integer codes for the four canonical Cortex verdict levels."""
+
+    MALICIOUS = 0
+    SUSPICIOUS = 1
+    SAFE = 2
+    INFO = 3
+
+
+_LEVEL_CODES = {level.name.lower(): int(level) for level in Level}
+
+_UTC = timezone.utc
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO-8601 string, to the second."""
+    return datetime.now(_UTC).isoformat(timespec="seconds")
+
+
+@dataclass(slots=True, frozen=True)
 class AnalyzerResult:
-    """One Cortex analyzer verdict for an observable."""
+    """One Cortex analyzer verdict for an observable.
+
+    Frozen so that ``level`` (shown in reports) and ``level_code`` (used for
+    scoring) can never disagree.
+    """
 
     analyzer_name: str      # e.g. "VirusTotal_GetReport_3_1"
     level: str              # "malicious" | "suspicious" | "safe" | "info"
@@ -33,9 +57,16 @@ class AnalyzerResult:
     namespace: str = ""     # Taxonomy namespace (e.g. "VT")
     predicate: str = ""     # Taxonomy predicate (e.g. "Score")
     raw_value: str = ""     # Original taxonomy value string
+    # Integer Level code derived from `level` (unknown levels count as info)
+    level_code: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "level_code", _LEVEL_CODES.get(self.level, Level.INFO.value)
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class ObservableRisk:
     """Risk assessment for a single observable."""
 
@@ -44,7 +75,7 @@ class ObservableRisk:
     likelihood: float = 0.0  # 0.0 - 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskScore:
     """Final computed risk numbers for a case."""
 
@@ -54,7 +85,7 @@ class RiskScore:
     risk_level: str         # "Critical" | "High" | "Medium" | "Low" | "Info"
 
 
-@dataclass
+@dataclass(slots=True)
 class CaseRiskAssessment:
     """Complete risk assessment for one TheHive case."""
 
@@ -67,6 +98,9 @@ class CaseRiskAssessment:
     exposure_type: str = "email_only"                       # B2C: exposure category
     observables: List[ObservableRisk] = field(default_factory=list)
     risk_score: Optional[RiskScore] = None
-    timestamp: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    timestamp: str = field(default_factory=_now_iso)
+    # Last rendered report and the state it was rendered from; see
+    # reporter.generate_report(cache=True). Cleared by score_case().
+    rendered_report: Optional[Tuple[tuple, str]] = field(
+        default=None, init=False, repr=False, compare=False
     )
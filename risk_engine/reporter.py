@@ -7,10 +7,12 @@ back to TheHive as a task log.
 
 from __future__ import annotations
 
+import io
 import logging
-from typing import Dict, List
+from collections import Counter
+from typing import Callable, List, TextIO, Tuple
 
-from risk_engine.models import CaseRiskAssessment, ObservableRisk
+from risk_engine.models import CaseRiskAssessment, ObservableRisk, RiskScore
 
 logger = logging.getLogger(__name__)
 
@@ -19,224 +21,305 @@ logger = logging.getLogger(__name__)
 # Markdown Generation
 # -----------------------------------------------------------------------
 
+# Lookup tables are built once at import; recommendation lists are stored
+# as tuples so the shared copies can't be mutated by callers.
+
+_RISK_EMOJI = {
+    "Critical": "[!!!]",
+    "High": "[!!]",
+    "Medium": "[!]",
+    "Low": "[-]",
+    "Info": "[i]",
+}
+
+_B2B_RECOMMENDATIONS = {
+    "Critical": (
+        "Escalate to incident commander immediately",
+        "Isolate affected assets from the network",
+        "Begin forensic evidence preservation",
+        "Notify executive leadership and legal counsel",
+        "Activate incident response plan",
+    ),
+    "High": (
+        "Escalate to senior SOC analyst",
+        "Restrict access to affected assets",
+        "Run full endpoint scan on associated hosts",
+        "Review related cases for lateral movement indicators",
+    ),
+    "Medium": (
+        "Assign to SOC analyst for investigation",
+        "Run additional Cortex analyzers for enrichment",
+        "Monitor associated assets for 48 hours",
+    ),
+    "Low": (
+        "Document findings for trend analysis",
+        "Schedule routine review within 7 days",
+    ),
+    "Info": (
+        "No immediate action required",
+        "Log for baseline and reporting purposes",
+    ),
+}
+_B2B_FALLBACK = ("Review case manually",)
+
+_B2C_RECOMMENDATIONS = {
+    "Critical": (
+        "Freeze credit at all three bureaus (Equifax, Experian, TransUnion)",
+        "File an identity theft report at IdentityTheft.gov (FTC)",
+        "File a police report with local law enforcement",
+        "Contact the IRS Identity Protection Specialized Unit",
+        "Notify health insurance provider of potential medical identity theft",
+        "Place extended fraud alert (7 years) with credit bureaus",
+    ),
+    "High": (
+        "Freeze credit at all three bureaus immediately",
+        "Place fraud alerts with all three credit bureaus",
+        "Change all financial account passwords and enable MFA",
+        "Monitor bank and credit card statements daily for 90 days",
+        "Consider enrolling in an identity theft protection service",
+    ),
+    "Medium": (
+        "Place an initial fraud alert (1 year) with credit bureaus",
+        "Change compromised account passwords immediately",
+        "Enable multi-factor authentication on all accounts",
+        "Review credit reports at AnnualCreditReport.com",
+        "Monitor accounts weekly for 60 days",
+    ),
+    "Low": (
+        "Change the compromised password immediately",
+        "Enable multi-factor authentication on the affected account",
+        "Monitor the account for suspicious activity",
+        "Check haveibeenpwned.com for additional exposures",
+    ),
+    "Info": (
+        "No immediate action required",
+        "Monitor with free annual credit report",
+        "Consider enabling MFA on sensitive accounts as a precaution",
+    ),
+}
+_B2C_FALLBACK = ("Consult with a senior analyst",)
+
+
+def _numbered(items) -> str:
+    """Render items as a markdown numbered list, one per line."""
+    return "".join(f"{i}. {item}\n" for i, item in enumerate(items, 1))
+
+
+# Recommendation text is fixed per (profile, level), so the numbered
+# markdown blocks are rendered once here rather than on every report.
+_B2B_RECOMMENDATION_BLOCKS = {
+    level: _numbered(recs) for level, recs in _B2B_RECOMMENDATIONS.items()
+}
+_B2B_FALLBACK_BLOCK = _numbered(_B2B_FALLBACK)
+_B2C_RECOMMENDATION_BLOCKS = {
+    level: _numbered(recs) for level, recs in _B2C_RECOMMENDATIONS.items()
+}
+_B2C_FALLBACK_BLOCK = _numbered(_B2C_FALLBACK)
+
+
 def _risk_emoji(level: str) -> str:
     """Return a text indicator for a risk level (safe for markdown)."""
-    return {
-        "Critical": "[!!!]",
-        "High": "[!!]",
-        "Medium": "[!]",
-        "Low": "[-]",
-        "Info": "[i]",
-    }.get(level, "")
+    return _RISK_EMOJI.get(level, "")
 
 
 def _verdict_summary(obs: ObservableRisk) -> str:
     """One-line summary of analyzer verdicts for an observable."""
     if not obs.analyzer_results:
         return "No analyzer results"
-    counts: Dict[str, int] = {}
-    for r in obs.analyzer_results:
-        counts[r.level] = counts.get(r.level, 0) + 1
-    parts = [f"{count} {level}" for level, count in sorted(counts.items())]
-    return ", ".join(parts)
+    counts = Counter(r.level for r in obs.analyzer_results)
+    return ", ".join([f"{count} {level}" for level, count in sorted(counts.items())])
 
 
 def _recommendations(level: str) -> List[str]:
     """Return recommended actions for B2B cases based on risk level."""
-    base = {
-        "Critical": [
-            "Escalate to incident commander immediately",
-            "Isolate affected assets from the network",
-            "Begin forensic evidence preservation",
-            "Notify executive leadership and legal counsel",
-            "Activate incident response plan",
-        ],
-        "High": [
-            "Escalate to senior SOC analyst",
-            "Restrict access to affected assets",
-            "Run full endpoint scan on associated hosts",
-            "Review related cases for lateral movement indicators",
-        ],
-        "Medium": [
-            "Assign to SOC analyst for investigation",
-            "Run additional Cortex analyzers for enrichment",
-            "Monitor associated assets for 48 hours",
-        ],
-        "Low": [
-            "Document findings for trend analysis",
-            "Schedule routine review within 7 days",
-        ],
-        "Info": [
-            "No immediate action required",
-            "Log for baseline and reporting purposes",
-        ],
-    }
-    return base.get(level, ["Review case manually"])
+    return list(_B2B_RECOMMENDATIONS.get(level, _B2B_FALLBACK))
 
 
 def _b2c_recommendations(level: str) -> List[str]:
     """Return recommended recovery actions for consumer identity-theft cases."""
-    base = {
-        "Critical": [
-            "Freeze credit at all three bureaus (Equifax, Experian, TransUnion)",
-            "File an identity theft report at IdentityTheft.gov (FTC)",
-            "File a police report with local law enforcement",
-            "Contact the IRS Identity Protection Specialized Unit",
-            "Notify health insurance provider of potential medical identity theft",
-            "Place extended fraud alert (7 years) with credit bureaus",
-        ],
-        "High": [
-            "Freeze credit at all three bureaus immediately",
-            "Place fraud alerts with all three credit bureaus",
-            "Change all financial account passwords and enable MFA",
-            "Monitor bank and credit card statements daily for 90 days",
-            "Consider enrolling in an identity theft protection service",
-        ],
-        "Medium": [
-            "Place an initial fraud alert (1 year) with credit bureaus",
-            "Change compromised account passwords immediately",
-            "Enable multi-factor authentication on all accounts",
-            "Review credit reports at AnnualCreditReport.com",
-            "Monitor accounts weekly for 60 days",
-        ],
-        "Low": [
-            "Change the compromised password immediately",
-            "Enable multi-factor authentication on the affected account",
-            "Monitor the account for suspicious activity",
-            "Check haveibeenpwned.com for additional exposures",
-        ],
-        "Info": [
-            "No immediate action required",
-            "Monitor with free annual credit report",
-            "Consider enabling MFA on sensitive accounts as a precaution",
-        ],
-    }
-    return base.get(level, ["Consult with a senior analyst"])
-
-
-def generate_report(assessment: CaseRiskAssessment) -> str:
-    """Build a full markdown risk report.
+    return list(_B2C_RECOMMENDATIONS.get(level, _B2C_FALLBACK))
 
-    Produces a B2B report (ALE / dollar values) or a B2C consumer report
-    (Recovery Difficulty Score / identity-theft actions) based on
-    assessment.profile.
-    """
-    risk = assessment.risk_score
-    if risk is None:
-        return "**Error:** Case has not been scored yet."
 
-    is_b2c = assessment.profile == "consumer"
-    indicator = _risk_emoji(risk.risk_level)
-
-    # --- Header ---
-    lines = [
-        f"# {'Consumer Identity-Theft' if is_b2c else 'Risk'} Assessment Report",
-        "",
-        f"**Case:** {assessment.case_title} (`{assessment.case_id}`)",
-        f"**Assessed:** {assessment.timestamp}",
-        f"**Profile:** {'Consumer (B2C)' if is_b2c else 'Business (B2B)'}",
-        "",
-        "---",
-        "",
-        "## Executive Summary",
-        "",
-    ]
+def _b2b_header(assessment: CaseRiskAssessment, risk: RiskScore) -> str:
+    """Header, executive summary and ALE scoring table for a B2B report."""
+    return f"""\
+# Risk Assessment Report
 
-    if is_b2c:
-        lines.append(
-            f"{indicator} This case has a **{risk.risk_level}** severity level "
-            f"with a recovery difficulty score of **{risk.ale:.1f} / 100**."
-        )
-    else:
-        lines.append(
-            f"{indicator} This case has a **{risk.risk_level}** risk level "
-            f"with an estimated annual loss exposure of **${risk.ale:,.2f}**."
-        )
+**Case:** {assessment.case_title} (`{assessment.case_id}`)
+**Assessed:** {assessment.timestamp}
+**Profile:** Business (B2B)
 
-    lines += ["", "---", "", "## Risk Calculation", ""]
+---
 
-    # --- Scoring table ---
-    lines += [
-        "| Metric | Value |",
-        "|--------|-------|",
-        f"| Likelihood | {risk.likelihood:.2%} |",
-    ]
+## Executive Summary
 
-    if is_b2c:
-        lines += [
-            f"| Exposure Type | {assessment.exposure_type} |",
-            f"| Exposure Severity | {risk.impact_dollars:.0f} / 100 |",
-            f"| **Recovery Difficulty** | **{risk.ale:.1f} / 100** |",
-            f"| **Severity Level** | **{risk.risk_level}** |",
-        ]
-        lines += [
-            "",
-            "> *Recovery Difficulty = Likelihood x Exposure Severity*",
-            "",
-        ]
-    else:
-        lines += [
-            f"| Asset Type | {assessment.asset_type} |",
-            f"| Sensitivity | {assessment.sensitivity} |",
-            f"| Impact (SLE) | ${risk.impact_dollars:,.0f} |",
-            f"| **ALE (Annualized Loss)** | **${risk.ale:,.2f}** |",
-            f"| **Risk Level** | **{risk.risk_level}** |",
-        ]
-        lines += [
-            "",
-            "> *ALE = Likelihood x Impact (Single Loss Expectancy)*",
-            "",
-        ]
+{_risk_emoji(risk.risk_level)} This case has a **{risk.risk_level}** risk level \
+with an estimated annual loss exposure of **${risk.ale:,.2f}**.
+
+---
+
+## Risk Calculation
+
+| Metric | Value |
+|--------|-------|
+| Likelihood | {risk.likelihood:.2%} |
+| Asset Type | {assessment.asset_type} |
+| Sensitivity | {assessment.sensitivity} |
+| Impact (SLE) | ${risk.impact_dollars:,.0f} |
+| **ALE (Annualized Loss)** | **${risk.ale:,.2f}** |
+| **Risk Level** | **{risk.risk_level}** |
+
+> *ALE = Likelihood x Impact (Single Loss Expectancy)*
+
+"""
+
+
+def _b2c_header(assessment: CaseRiskAssessment, risk: RiskScore) -> str:
+    """Header, executive summary and severity scoring table for a consumer report."""
+    return f"""\
+# Consumer Identity-Theft Assessment Report
+
+**Case:** {assessment.case_title} (`{assessment.case_id}`)
+**Assessed:** {assessment.timestamp}
+**Profile:** Consumer (B2C)
+
+---
+
+## Executive Summary
+
+{_risk_emoji(risk.risk_level)} This case has a **{risk.risk_level}** severity level \
+with a recovery difficulty score of **{risk.ale:.1f} / 100**.
+
+---
+
+## Risk Calculation
+
+| Metric | Value |
+|--------|-------|
+| Likelihood | {risk.likelihood:.2%} |
+| Exposure Type | {assessment.exposure_type} |
+| Exposure Severity | {risk.impact_dollars:.0f} / 100 |
+| **Recovery Difficulty** | **{risk.ale:.1f} / 100** |
+| **Severity Level** | **{risk.risk_level}** |
+
+> *Recovery Difficulty = Likelihood x Exposure Severity*
+
+"""
+
+
+def _report_key(assessment: CaseRiskAssessment, risk: RiskScore) -> Tuple:
+    """Cheap signature of everything that shapes a scored assessment's report."""
+    return (
+        assessment.case_id,
+        assessment.case_title,
+        assessment.timestamp,
+        assessment.profile,
+        assessment.asset_type,
+        assessment.sensitivity,
+        assessment.exposure_type,
+        risk.likelihood,
+        risk.impact_dollars,
+        risk.ale,
+        risk.risk_level,
+        len(assessment.observables),
+        sum(len(o.analyzer_results) for o in assessment.observables),
+    )
+
+
+_UNSCORED_REPORT = "**Error:** Case has not been scored yet."
+
+
+def _emit_report(
+    assessment: CaseRiskAssessment, risk: RiskScore, write: Callable[[str], object]
+) -> None:
+    """Write the markdown report for a scored assessment chunk by chunk."""
+    is_b2c = assessment.profile == "consumer"
+
+    # --- Header, executive summary and scoring table ---
+    write(_b2c_header(assessment, risk) if is_b2c else _b2b_header(assessment, risk))
 
     # --- Observable breakdown ---
+    # One pass over the observables: summary rows go straight out, the
+    # per-observable analyzer tables are buffered and follow the summary.
     if assessment.observables:
-        lines += [
-            "---",
-            "",
-            "## Observable Breakdown",
-            "",
-            "| Observable | Type | Likelihood | Verdicts |",
-            "|------------|------|------------|----------|",
-        ]
+        write("---\n\n## Observable Breakdown\n\n")
+        write("| Observable | Type | Likelihood | Verdicts |\n")
+        write("|------------|------|------------|----------|\n")
+        details = io.StringIO()
+        detail = details.write
         for obs in assessment.observables:
-            lines.append(
-                f"| `{obs.observable.value}` "
-                f"| {obs.observable.data_type} "
+            o = obs.observable
+            write(
+                f"| `{o.value}` "
+                f"| {o.data_type} "
                 f"| {obs.likelihood:.2%} "
-                f"| {_verdict_summary(obs)} |"
+                f"| {_verdict_summary(obs)} |\n"
             )
-        lines.append("")
-
-        # Detailed analyzer results per observable
-        lines += ["### Detailed Analyzer Results", ""]
-        for obs in assessment.observables:
             if not obs.analyzer_results:
                 continue
-            lines.append(f"**`{obs.observable.value}`** ({obs.observable.data_type})")
-            lines.append("")
-            lines.append("| Analyzer | Verdict | Score | Detail |")
-            lines.append("|----------|---------|-------|--------|")
+            detail(f"**`{o.value}`** ({o.data_type})\n")
+            detail("\n")
+            detail("| Analyzer | Verdict | Score | Detail |\n")
+            detail("|----------|---------|-------|--------|\n")
             for r in obs.analyzer_results:
-                lines.append(
+                detail(
                     f"| {r.analyzer_name} | {r.level} | {r.raw_value} "
-                    f"| {r.namespace}:{r.predicate} |"
+                    f"| {r.namespace}:{r.predicate} |\n"
                 )
-            lines.append("")
+            detail("\n")
+        write("\n")
+
+        # Detailed analyzer results (omitted when nothing ran)
+        if details.tell():
+            write("### Detailed Analyzer Results\n\n")
+            write(details.getvalue())
 
     # --- Recommendations ---
-    recs = _b2c_recommendations(risk.risk_level) if is_b2c else _recommendations(risk.risk_level)
-    lines += [
-        "---",
-        "",
-        f"## Recommended {'Recovery' if is_b2c else ''} Actions",
-        "",
-    ]
-    for i, rec in enumerate(recs, 1):
-        lines.append(f"{i}. {rec}")
-    lines += [
-        "",
-        "---",
-        "*Report generated by SOC Risk Engine*",
-    ]
-
-    return "\n".join(lines)
+    write(f"---\n\n## Recommended {'Recovery' if is_b2c else ''} Actions\n\n")
+    if is_b2c:
+        write(_B2C_RECOMMENDATION_BLOCKS.get(risk.risk_level, _B2C_FALLBACK_BLOCK))
+    else:
+        write(_B2B_RECOMMENDATION_BLOCKS.get(risk.risk_level, _B2B_FALLBACK_BLOCK))
+    write("\n---\n*Report generated by SOC Risk Engine*")
+
+
+def generate_report(assessment: CaseRiskAssessment, *, cache: bool = False) -> str:
+    """Build a full markdown risk report.
+
+    Produces a B2B report (ALE / dollar values) or a B2C consumer report
+    (Recovery Difficulty Score / identity-theft actions) based on
+    assessment.profile.
+
+    With ``cache=True`` the report is kept on the assessment, and a repeat
+    render of an unchanged assessment (same case, scores and
+    observable/result counts) returns the previously built string.
+    """
+    risk = assessment.risk_score
+    if risk is None:
+        return _UNSCORED_REPORT
+
+    if cache:
+        key = _report_key(assessment, risk)
+        cached = assessment.rendered_report
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        report = generate_report(assessment)
+        assessment.rendered_report = (key, report)
+        return report
+
+    buf = io.StringIO()
+    _emit_report(assessment, risk, buf.write)
+    return buf.getvalue()
+
+
+def write_report(assessment: CaseRiskAssessment, fp: TextIO) -> None:
+    """Stream the markdown report to a text file-like object.
+
+    Produces the same text as generate_report() without building the whole
+    report as one string first.
+    """
+    risk = assessment.risk_score
+    if risk is None:
+        fp.write(_UNSCORED_REPORT)
+        return
+    _emit_report(assessment, risk, fp.write)
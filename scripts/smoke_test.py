@@ -11,36 +11,32 @@ Usage:
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
 
 THEHIVE_URL = "http://localhost:9000"
 CORTEX_URL = "http://localhost:9001"
 ES_URL = "http://localhost:9200"
 
-passed = 0
-failed = 0
+# One keep-alive pool per host, shared by the concurrent probes
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 
-def check(name: str, url: str, expected_status: int = 200) -> bool:
-    global passed, failed
+def check(name: str, url: str, expected_status: int = 200) -> Tuple[bool, str]:
+    """Probe one endpoint; return (passed, result line)."""
     try:
-        resp = requests.get(url, timeout=10)
+        resp = SESSION.get(url, timeout=10)
         if resp.status_code == expected_status:
-            print(f"  [PASS] {name} — {url} ({resp.status_code})")
-            passed += 1
-            return True
-        else:
-            print(f"  [FAIL] {name} — {url} (got {resp.status_code}, expected {expected_status})")
-            failed += 1
-            return False
+            return True, f"  [PASS] {name} — {url} ({resp.status_code})"
+        return False, f"  [FAIL] {name} — {url} (got {resp.status_code}, expected {expected_status})"
     except requests.ConnectionError:
-        print(f"  [FAIL] {name} — {url} (connection refused)")
-        failed += 1
-        return False
+        return False, f"  [FAIL] {name} — {url} (connection refused)"
     except requests.Timeout:
-        print(f"  [FAIL] {name} — {url} (timed out)")
-        failed += 1
-        return False
+        return False, f"  [FAIL] {name} — {url} (timed out)"
 
 
 def main():
@@ -49,13 +45,23 @@ def main():
     print("=" * 60)
     print()
 
-    # Infrastructure
+    # Infrastructure — probes are independent, so run them concurrently and
+    # print results in a stable order once they're all back.
+    checks = [
+        ("Elasticsearch", f"{ES_URL}/_cluster/health"),
+        ("Cortex API",    f"{CORTEX_URL}/api/status"),
+        ("TheHive API",   f"{THEHIVE_URL}/api/status"),
+    ]
     print("Infrastructure Services:")
-    check("Elasticsearch", f"{ES_URL}/_cluster/health")
-    check("Cortex API",    f"{CORTEX_URL}/api/status")
-    check("TheHive API",   f"{THEHIVE_URL}/api/status")
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        results = list(pool.map(lambda c: check(*c), checks))
+    for _, line in results:
+        print(line)
     print()
 
+    passed = sum(1 for ok, _ in results if ok)
+    failed = len(results) - passed
+
     # Summary
     total = passed + failed
     print("-" * 60)
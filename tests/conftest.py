@@ -3,10 +3,18 @@ Shared test fixtures for the SOC Risk Engine test suite.
 
 Provides sample B2B and B2C CaseRiskAssessment objects with
 pre-built observables and analyzer results.
+
+The observable and analyzer-result fixtures are read-only inputs and are
+built once per session; assessments are rebuilt per test because scoring
+mutates them. The rendered-report fixtures score and render a private copy
+once per session, for tests that only assert on the markdown.
 """
 
 import pytest
 
+from risk_engine.calculator import score_case
+from risk_engine.reporter import generate_report
+
 from risk_engine.models import (
     AnalyzerResult,
     CaseRiskAssessment,
@@ -19,7 +27,7 @@ from risk_engine.models import (
 # Analyzer Results
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def malicious_result():
     return AnalyzerResult(
         analyzer_name="VirusTotal_GetReport_3_1",
@@ -31,7 +39,7 @@ def malicious_result():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def suspicious_result():
     return AnalyzerResult(
         analyzer_name="AbuseIPDB_1_0",
@@ -43,7 +51,7 @@ def suspicious_result():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def safe_result():
     return AnalyzerResult(
         analyzer_name="URLhaus_2_0",
@@ -55,7 +63,7 @@ def safe_result():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def info_result():
     return AnalyzerResult(
         analyzer_name="Whois_1_0",
@@ -71,12 +79,12 @@ def info_result():
 # Observables
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ip_observable():
     return Observable(id="obs-1", data_type="ip", value="203.0.113.42", tlp=2)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def email_observable():
     return Observable(id="obs-2", data_type="mail", value="victim@example.com", tlp=2)
 
@@ -85,8 +93,7 @@ def email_observable():
 # B2B Assessment
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def b2b_assessment(ip_observable, malicious_result, suspicious_result):
+def _b2b_assessment(ip_observable, malicious_result, suspicious_result):
     return CaseRiskAssessment(
         case_id="~100",
         case_title="Suspicious Network Activity",
@@ -103,12 +110,16 @@ def b2b_assessment(ip_observable, malicious_result, suspicious_result):
     )
 
 
+@pytest.fixture
+def b2b_assessment(ip_observable, malicious_result, suspicious_result):
+    return _b2b_assessment(ip_observable, malicious_result, suspicious_result)
+
+
 # ---------------------------------------------------------------------------
 # B2C Consumer Assessment
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-def b2c_assessment(email_observable, malicious_result):
+def _b2c_assessment(email_observable, malicious_result):
     return CaseRiskAssessment(
         case_id="~200",
         case_title="Consumer Identity Theft Report",
@@ -124,6 +135,11 @@ def b2c_assessment(email_observable, malicious_result):
     )
 
 
+@pytest.fixture
+def b2c_assessment(email_observable, malicious_result):
+    return _b2c_assessment(email_observable, malicious_result)
+
+
 # ---------------------------------------------------------------------------
 # Empty Assessment (no observables)
 # ---------------------------------------------------------------------------
@@ -139,3 +155,21 @@ def empty_assessment():
         sensitivity="public",
         observables=[],
     )
+
+
+# ---------------------------------------------------------------------------
+# Rendered Reports
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def b2b_report(ip_observable, malicious_result, suspicious_result):
+    assessment = _b2b_assessment(ip_observable, malicious_result, suspicious_result)
+    score_case(assessment)
+    return generate_report(assessment)
+
+
+@pytest.fixture(scope="session")
+def b2c_report(email_observable, malicious_result):
+    assessment = _b2c_assessment(email_observable, malicious_result)
+    score_case(assessment)
+    return generate_report(assessment)
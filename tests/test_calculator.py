@@ -60,11 +60,39 @@ class TestComputeLikelihood:
         # avg = (1.0 + 1.0 + 0.0) / 3 = 0.6667, boosted to 0.8333
         assert lh == pytest.approx(0.8333, abs=0.01)
 
+    def test_no_consensus_from_repeated_analyzer(self):
+        """Several malicious verdicts from one analyzer are not a consensus."""
+        results = [
+            AnalyzerResult(analyzer_name="VT", level="malicious", score=10.0),
+            AnalyzerResult(analyzer_name="VT", level="malicious", score=9.0),
+            AnalyzerResult(analyzer_name="Whois", level="info", score=0.0),
+            AnalyzerResult(analyzer_name="Abuse", level="info", score=0.0),
+        ]
+        lh = compute_likelihood(results)
+        # avg = (1.0 + 1.0 + 0.0 + 0.0) / 4 = 0.5, no boost
+        assert lh == pytest.approx(0.5)
+
     def test_no_consensus_with_single_malicious(self, malicious_result, info_result):
         lh = compute_likelihood([malicious_result, info_result])
         # avg = 0.5, only 1 malicious analyzer — no boost
         assert lh == pytest.approx(0.5)
 
+    def test_unknown_level_weighs_zero(self, malicious_result):
+        unknown = AnalyzerResult(analyzer_name="Custom", level="unknown", score=0.0)
+        lh = compute_likelihood([malicious_result, unknown])
+        assert lh == pytest.approx(0.5)
+
+    def test_large_mixed_batch(self):
+        """Many verdicts: plain weighted average, boost from distinct malicious analyzers."""
+        levels = ["malicious", "suspicious", "safe", "info"]
+        results = [
+            AnalyzerResult(analyzer_name=f"A{i % 5}", level=levels[i % 4], score=0.0)
+            for i in range(40)
+        ]
+        lh = compute_likelihood(results)
+        # avg = (1.0 + 0.6 + 0.1 + 0.0) / 4 = 0.425, boosted 1.25x = 0.53125
+        assert lh == pytest.approx(0.53125)
+
     def test_capped_at_one(self):
         """Likelihood should never exceed 1.0 even with boost."""
         results = [
@@ -102,6 +130,11 @@ class TestComputeImpactB2B:
         # Falls back to DEFAULT_ASSET_VALUE (50000) * 2.0
         assert impact == 50_000 * 2.0
 
+    def test_mixed_case_keys_are_not_normalised(self):
+        # Keys must already be lowercase; process_case does that for callers
+        impact = compute_impact("Database", "Restricted", profile="b2b")
+        assert impact == 50_000 * 2.0
+
 
 # -----------------------------------------------------------------------
 # compute_impact — B2C
@@ -0,0 +1,102 @@
+"""
+Tests for risk_engine.clients.cortex — per-observable result caching.
+"""
+
+import pytest
+
+from risk_engine.clients.cortex import CortexClient
+
+
+def _job(level, analyzer="VT"):
+    return {
+        "id": "job-1",
+        "analyzerName": analyzer,
+        "report": {
+            "summary": {
+                "taxonomies": [
+                    {"level": level, "namespace": "VT", "predicate": "Score", "value": "5/10"},
+                ]
+            }
+        },
+    }
+
+
+@pytest.fixture
+def jobs_by_value():
+    return {"203.0.113.42": [_job("malicious")], "198.51.100.7": []}
+
+
+@pytest.fixture
+def make_client(monkeypatch, jobs_by_value):
+    """Build a CortexClient whose job search is served from jobs_by_value and counted."""
+
+    def factory(**kwargs):
+        client = CortexClient(url="http://cortex.test", api_key="", **kwargs)
+        client.calls = 0
+
+        def fake_jobs(value, data_type):
+            client.calls += 1
+            return [dict(j) for j in jobs_by_value[value]]
+
+        monkeypatch.setattr(client, "get_observable_jobs", fake_jobs)
+        return client
+
+    return factory
+
+
+class TestResultCache:
+    def test_repeat_lookup_served_from_cache(self, make_client):
+        client = make_client(cache_ttl=60)
+        first = client.get_analyzer_results("203.0.113.42", "ip")
+        second = client.get_analyzer_results("203.0.113.42", "ip")
+        assert client.calls == 1
+        assert second == first
+
+    def test_cache_keyed_by_data_type(self, make_client):
+        client = make_client(cache_ttl=60)
+        client.get_analyzer_results("203.0.113.42", "ip")
+        client.get_analyzer_results("203.0.113.42", "other")
+        assert client.calls == 2
+
+    def test_empty_results_not_cached(self, make_client):
+        client = make_client(cache_ttl=60)
+        client.get_analyzer_results("198.51.100.7", "ip")
+        client.get_analyzer_results("198.51.100.7", "ip")
+        assert client.calls == 2
+
+    def test_zero_ttl_disables_cache(self, make_client):
+        client = make_client(cache_ttl=0)
+        client.get_analyzer_results("203.0.113.42", "ip")
+        client.get_analyzer_results("203.0.113.42", "ip")
+        assert client.calls == 2
+
+    @pytest.mark.parametrize("size", [0, -1])
+    def test_non_positive_size_disables_cache(self, make_client, size):
+        client = make_client(cache_ttl=60, cache_size=size)
+        first = client.get_analyzer_results("203.0.113.42", "ip")
+        second = client.get_analyzer_results("203.0.113.42", "ip")
+        assert client.calls == 2
+        assert second == first
+        assert len(client._cache) == 0
+
+    def test_expired_entry_refetched(self, make_client, monkeypatch):
+        client = make_client(cache_ttl=60)
+        clock = [1000.0]
+        monkeypatch.setattr("risk_engine.clients.cortex.time.monotonic", lambda: clock[0])
+        client.get_analyzer_results("203.0.113.42", "ip")
+        clock[0] += 61
+        client.get_analyzer_results("203.0.113.42", "ip")
+        assert client.calls == 2
+
+    def test_size_bound_evicts_oldest(self, make_client, jobs_by_value):
+        jobs_by_value["192.0.2.1"] = [_job("safe")]
+        client = make_client(cache_ttl=60, cache_size=1)
+        client.get_analyzer_results("203.0.113.42", "ip")
+        client.get_analyzer_results("192.0.2.1", "ip")
+        client.get_analyzer_results("203.0.113.42", "ip")
+        assert client.calls == 3
+
+    def test_returned_list_is_a_copy(self, make_client):
+        client = make_client(cache_ttl=60)
+        client.get_analyzer_results("203.0.113.42", "ip").clear()
+        assert len(client.get_analyzer_results("203.0.113.42", "ip")) == 1
@@ -0,0 +1,191 @@
+"""
+Tests for risk_engine.main — the process_case pipeline, run against
+in-memory fakes of the TheHive and Cortex clients.
+"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from risk_engine import config
+from risk_engine.main import _extract_tag, process_case
+from risk_engine.models import AnalyzerResult, Observable
+
+
+class FakeHive:
+    """Stands in for TheHiveClient: serves one case and records what is posted."""
+
+    def __init__(self, tags=None, observables=None):
+        self.case = {"title": "Fake Case", "severity": 2, "tags": tags or []}
+        self.observables = observables or []
+        self.logs = []
+        self.tags_added = []
+
+    def get_case(self, case_id):
+        return self.case
+
+    def get_case_observables(self, case_id):
+        return self.observables
+
+    def find_or_create_risk_task(self, case_id):
+        return "task-1"
+
+    def add_task_log(self, task_id, content):
+        self.logs.append(content)
+
+    def add_case_tag(self, case_id, tag):
+        self.tags_added.append(tag)
+
+
+class FakeCortex:
+    """Stands in for CortexClient: returns canned verdicts per observable value."""
+
+    def __init__(self, results=None):
+        self.results = results or {}
+
+    def get_analyzer_results(self, observable_value, data_type):
+        return list(self.results.get(observable_value, []))
+
+
+class SlowCortex(FakeCortex):
+    """FakeCortex with a per-observable delay, optionally failing one lookup.
+
+    Tracks the peak number of lookups in flight at once.
+    """
+
+    def __init__(self, results=None, delays=None, fail_on=None):
+        super().__init__(results)
+        self.delays = delays or {}
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_analyzer_results(self, observable_value, data_type):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(observable_value, 0.0))
+            if observable_value == self.fail_on:
+                raise RuntimeError(f"Cortex lookup failed for {observable_value}")
+            return super().get_analyzer_results(observable_value, data_type)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+# -----------------------------------------------------------------------
+# Unknown tag values
+# -----------------------------------------------------------------------
+
+class TestUnknownValues:
+    def test_unknown_sensitivity_uses_default(self, caplog):
+        hive = FakeHive(tags=["sensitivity:top_secret"])
+        with caplog.at_level(logging.WARNING, logger="risk_engine"):
+            assessment = process_case("~1", hive, FakeCortex())
+        assert assessment.sensitivity == config.DEFAULT_SENSITIVITY
+        assert "Unknown sensitivity 'top_secret'" in caplog.text
+
+    def test_unknown_exposure_uses_default(self, caplog):
+        hive = FakeHive(tags=["profile:consumer", "exposure:passport"])
+        with caplog.at_level(logging.WARNING, logger="risk_engine"):
+            assessment = process_case("~2", hive, FakeCortex())
+        assert assessment.profile == "consumer"
+        assert assessment.exposure_type == config.DEFAULT_EXPOSURE_TYPE
+        assert "Unknown exposure type 'passport'" in caplog.text
+
+    def test_unknown_asset_type_keeps_name(self):
+        hive = FakeHive(tags=["asset:mainframe"])
+        assessment = process_case("~3", hive, FakeCortex())
+        assert assessment.asset_type == "mainframe"
+        assert assessment.risk_score.impact_dollars == (
+            config.DEFAULT_ASSET_VALUE
+            * config.SENSITIVITY_MULTIPLIERS[config.DEFAULT_SENSITIVITY]
+        )
+
+
+# -----------------------------------------------------------------------
+# Case-insensitive tags and CLI overrides
+# -----------------------------------------------------------------------
+
+class TestExtractTag:
+    def test_prefix_and_value_are_case_insensitive(self):
+        assert _extract_tag(["ASSET:Database"], "asset:", "server") == "database"
+
+    def test_missing_tag_returns_default(self):
+        assert _extract_tag(["tlp:amber"], "asset:", "server") == "server"
+
+
+class TestMixedCaseInputs:
+    def test_mixed_case_b2b_tags(self):
+        hive = FakeHive(tags=["Asset:Database", "SENSITIVITY:Restricted"])
+        assessment = process_case("~4", hive, FakeCortex())
+        assert assessment.asset_type == "database"
+        assert assessment.sensitivity == "restricted"
+        assert assessment.risk_score.impact_dollars == 500_000 * 10.0
+
+    def test_mixed_case_consumer_tags(self):
+        hive = FakeHive(tags=["Profile:Consumer", "Exposure:SSN"])
+        assessment = process_case("~5", hive, FakeCortex())
+        assert assessment.profile == "consumer"
+        assert assessment.exposure_type == "ssn"
+        assert assessment.risk_score.impact_dollars == 85
+
+    def test_mixed_case_overrides_win_over_tags(self):
+        hive = FakeHive(tags=["asset:workstation", "sensitivity:public"])
+        assessment = process_case(
+            "~6", hive, FakeCortex(), asset_type="Database", sensitivity="Restricted"
+        )
+        assert assessment.asset_type == "database"
+        assert assessment.sensitivity == "restricted"
+        assert assessment.risk_score.impact_dollars == 500_000 * 10.0
+
+    def test_mixed_case_profile_override(self):
+        hive = FakeHive(tags=["profile:b2b"])
+        assessment = process_case(
+            "~7", hive, FakeCortex(), profile="Consumer", exposure_type="Bank_Account"
+        )
+        assert assessment.profile == "consumer"
+        assert assessment.exposure_type == "bank_account"
+        assert assessment.risk_score.impact_dollars == 60
+
+
+# -----------------------------------------------------------------------
+# Concurrent enrichment
+# -----------------------------------------------------------------------
+
+def _observables(n):
+    return [Observable(id=f"obs-{i}", data_type="ip", value=f"10.0.0.{i}") for i in range(n)]
+
+
+class TestEnrichment:
+    def test_results_keep_input_order(self, monkeypatch):
+        monkeypatch.setattr(config, "ENRICHMENT_WORKERS", 4)
+        observables = _observables(4)
+        # Earlier observables answer later, so completion order is reversed
+        delays = {o.value: 0.02 * (4 - i) for i, o in enumerate(observables)}
+        results = {
+            o.value: [AnalyzerResult(analyzer_name=f"A{i}", level="safe", score=0.0)]
+            for i, o in enumerate(observables)
+        }
+        hive = FakeHive(observables=observables)
+        cortex = SlowCortex(results, delays)
+        assessment = process_case("~8", hive, cortex)
+        # The lookups overlapped (a serial loop would peak at 1)
+        assert cortex.peak_in_flight > 1
+        assert [r.observable for r in assessment.observables] == observables
+        assert [r.analyzer_results[0].analyzer_name for r in assessment.observables] == [
+            "A0", "A1", "A2", "A3",
+        ]
+
+    def test_lookup_error_propagates(self, monkeypatch):
+        monkeypatch.setattr(config, "ENRICHMENT_WORKERS", 4)
+        observables = _observables(3)
+        hive = FakeHive(observables=observables)
+        cortex = SlowCortex(delays={"10.0.0.0": 0.02}, fail_on="10.0.0.1")
+        with pytest.raises(RuntimeError, match="10.0.0.1"):
+            process_case("~9", hive, cortex)
+        assert hive.logs == []
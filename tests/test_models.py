@@ -2,9 +2,14 @@
 Tests for risk_engine.models — data model construction and defaults.
 """
 
+import dataclasses
+
+import pytest
+
 from risk_engine.models import (
     AnalyzerResult,
     CaseRiskAssessment,
+    Level,
     Observable,
     ObservableRisk,
     RiskScore,
@@ -37,6 +42,20 @@ class TestAnalyzerResult:
         assert r.predicate == ""
         assert r.raw_value == ""
 
+    def test_level_code(self):
+        r = AnalyzerResult(analyzer_name="VT", level="malicious", score=10.0)
+        assert r.level_code == Level.MALICIOUS
+
+    def test_unknown_level_code_is_info(self):
+        r = AnalyzerResult(analyzer_name="VT", level="unknown", score=0.0)
+        assert r.level_code == Level.INFO
+
+    def test_level_is_immutable(self):
+        r = AnalyzerResult(analyzer_name="VT", level="safe", score=0.0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            r.level = "malicious"
+        assert r.level_code == Level.SAFE
+
 
 class TestObservableRisk:
     def test_defaults(self):
@@ -88,3 +107,17 @@ class TestCaseRiskAssessment:
         from datetime import datetime
         dt = datetime.fromisoformat(a.timestamp)
         assert dt is not None
+
+
+class TestSlots:
+    def test_models_have_no_instance_dict(self):
+        obs = Observable(id="1", data_type="ip", value="1.2.3.4")
+        instances = [
+            obs,
+            AnalyzerResult(analyzer_name="VT", level="safe", score=0.0),
+            ObservableRisk(observable=obs),
+            RiskScore(likelihood=0.1, impact_dollars=1.0, ale=0.1, risk_level="Info"),
+            CaseRiskAssessment(case_id="~4", case_title="Test"),
+        ]
+        for instance in instances:
+            assert not hasattr(instance, "__dict__")